@@ -20,10 +20,17 @@ import argparse
 import json
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, Any, List
 
+import numpy as np
 import pandas as pd
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
 # ---------------------------------------------------------------------------
 # Traffic class mapping
 # ---------------------------------------------------------------------------
@@ -52,14 +59,26 @@ TRAFFIC_CLASSES = [
     },
 ]
 
+_CLASS_NAMES = [tc["name"] for tc in TRAFFIC_CLASSES]
+
+# Per-class patterns compiled once at import time; re.search(pattern_str, ...)
+# would pay a cache lookup on every call.
+_CLASS_PATTERNS = [(tc["name"], re.compile(tc["module_regex"])) for tc in TRAFFIC_CLASSES]
+
+# Single alternation over all class patterns, compiled once at import time,
+# so a whole module column can be classified in one vectorized pass.
+_CLASS_UNION_RE = re.compile(
+    "|".join(f"(?P<{tc['name']}>{tc['module_regex']})" for tc in TRAFFIC_CLASSES)
+)
+
 
 def classify_module(module_name: str) -> str:
     """
     Map a full module path to a traffic class name, or "" if none matches.
     """
-    for tc in TRAFFIC_CLASSES:
-        if re.search(tc["module_regex"], module_name):
-            return tc["name"]
+    for name, pattern in _CLASS_PATTERNS:
+        if pattern.search(module_name):
+            return name
     return ""
 
 
@@ -67,9 +86,63 @@ def classify_module(module_name: str) -> str:
 # Helpers
 # ---------------------------------------------------------------------------
 
+# Columns actually consumed by the summarizers; everything else in the
+# CSV-R export is dead weight and skipped at parse time.
+_USED_COLUMNS = (
+    "type",
+    "module",
+    "name",
+    "count",
+    "min",
+    "max",
+    "mean",
+    "stddev",
+    "vecvalue",
+    "value",
+)
+
+_FALLBACK_DTYPES = {
+    "type": "category",
+    "name": "category",
+    "module": "string",
+}
+
+
+def _read_results_csv(path: str) -> pd.DataFrame:
+    """
+    Load the CSV-R export, preferring the pyarrow engine when available
+    and falling back to the C engine otherwise.
+    """
+    header = pd.read_csv(path, nrows=0)
+    usecols = [c for c in header.columns if c in _USED_COLUMNS]
+
+    try:
+        return pd.read_csv(
+            path,
+            engine="pyarrow",
+            dtype_backend="pyarrow",
+            usecols=usecols,
+        )
+    except ImportError:
+        return pd.read_csv(
+            path,
+            engine="c",
+            low_memory=False,
+            usecols=usecols,
+            dtype={k: v for k, v in _FALLBACK_DTYPES.items() if k in usecols},
+        )
+
+
 def _attach_traffic_class(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df["traffic_class"] = df["module"].apply(classify_module)
+    # assign() only adds the new column reference; no full-frame copy.
+    matches = df["module"].astype(str).str.extract(_CLASS_UNION_RE)
+    df = df.assign(
+        traffic_class=np.select(
+            [matches[name].notna() for name in _CLASS_NAMES],
+            _CLASS_NAMES,
+            default="",
+        )
+    )
     return df[df["traffic_class"] != ""]
 
 
@@ -83,11 +156,21 @@ def _summarize_from_stats(stats_df: pd.DataFrame) -> Dict[str, Any]:
     summary: Dict[str, Any] = {"traffic_classes": {}}
     has_stddev = "stddev" in stats_df.columns
 
+    # One aggregation pass instead of a boolean mask per traffic class.
+    agg_spec = {
+        "count": ("count", "sum"),
+        "min": ("min", "min"),
+        "max": ("max", "max"),
+        "mean": ("mean", "mean"),
+    }
+    if has_stddev:
+        agg_spec["stddev"] = ("stddev", "mean")
+
+    agg = stats_df.groupby("traffic_class", observed=True).agg(**agg_spec)
+
     for tc in TRAFFIC_CLASSES:
         name = tc["name"]
-        rows = stats_df[stats_df["traffic_class"] == name]
-
-        if rows.empty:
+        if name not in agg.index:
             summary["traffic_classes"][name] = {
                 "stream": tc["stream"],
                 "pcp": tc["pcp"],
@@ -96,35 +179,48 @@ def _summarize_from_stats(stats_df: pd.DataFrame) -> Dict[str, Any]:
             }
             continue
 
-        count = float(rows["count"].sum())
-        min_s = float(rows["min"].min())
-        max_s = float(rows["max"].max())
-        mean_s = float(rows["mean"].mean())
-
-        if has_stddev:
-            std_s = float(rows["stddev"].mean())
-            jitter_ms = std_s * 1e3
-        else:
-            jitter_ms = None
+        row = agg.loc[name]
+        jitter_ms = float(row["stddev"]) * 1e3 if has_stddev else None
 
         summary["traffic_classes"][name] = {
             "stream": tc["stream"],
             "pcp": tc["pcp"],
             "present": True,
-            "count": int(count),
-            "min_ms": min_s * 1e3,
-            "max_ms": max_s * 1e3,
-            "mean_ms": mean_s * 1e3,
+            "count": int(row["count"]),
+            "min_ms": float(row["min"]) * 1e3,
+            "max_ms": float(row["max"]) * 1e3,
+            "mean_ms": float(row["mean"]) * 1e3,
             "jitter_ms": jitter_ms,
         }
 
     return summary
 
 
+def _tokenize_vecvalues(strings) -> "np.ndarray":
+    """
+    Parse a batch of space-separated vecvalue strings (any iterable, usually
+    the column's underlying object ndarray) into one float64 array.
+
+    Top-level so ProcessPoolExecutor can pickle it.
+    """
+    # Each string is something like "0.00102 2.5e-05 0.00101 ...";
+    # np.fromstring tokenizes it in C and stops at the first bad token.
+    arrays = [np.fromstring(str(s), sep=" ", dtype=np.float64) for s in strings]
+    return np.concatenate(arrays) if arrays else np.empty(0, dtype=np.float64)
+
+
+# Below this row count the process startup/pickle overhead outweighs the
+# parallel tokenization win.
+_PARALLEL_MIN_ROWS = 50_000
+
+
 def _summarize_from_vectors(vec_df: pd.DataFrame) -> Dict[str, Any]:
     """
     Given a 'vector' dataframe where vecvalue holds space-separated lists of
     samples (as strings), compute per-class bands (seconds → ms) and jitter_ms.
+
+    The per-class sample sets are disjoint, so for large inputs each class
+    is tokenized in its own worker process.
     """
     value_col = "vecvalue" if "vecvalue" in vec_df.columns else "value"
     if value_col not in vec_df.columns:
@@ -132,15 +228,34 @@ def _summarize_from_vectors(vec_df: pd.DataFrame) -> Dict[str, Any]:
             "Vector fallback: neither 'vecvalue' nor 'value' column found in CSV-R."
         )
 
-    import numpy as np
-
     summary: Dict[str, Any] = {"traffic_classes": {}}
 
+    # Slice the rows once per class (single groupby pass), then tokenize.
+    vals = vec_df[["traffic_class", value_col]].dropna(subset=[value_col])
+    # to_numpy() hands back the raw object array, skipping the Series
+    # per-item accessor overhead during tokenization.
+    class_strings = {
+        name: grp[value_col].to_numpy(copy=False)
+        for name, grp in vals.groupby("traffic_class", observed=True, sort=False)
+    }
+
+    if len(vals) >= _PARALLEL_MIN_ROWS and len(class_strings) > 1:
+        with ProcessPoolExecutor(max_workers=len(class_strings)) as pool:
+            futures = {
+                name: pool.submit(_tokenize_vecvalues, strings)
+                for name, strings in class_strings.items()
+            }
+            class_arrays = {name: fut.result() for name, fut in futures.items()}
+    else:
+        class_arrays = {
+            name: _tokenize_vecvalues(strings)
+            for name, strings in class_strings.items()
+        }
+
     for tc in TRAFFIC_CLASSES:
         name = tc["name"]
-        rows = vec_df[vec_df["traffic_class"] == name]
 
-        if rows.empty:
+        if name not in class_arrays:
             summary["traffic_classes"][name] = {
                 "stream": tc["stream"],
                 "pcp": tc["pcp"],
@@ -149,17 +264,8 @@ def _summarize_from_vectors(vec_df: pd.DataFrame) -> Dict[str, Any]:
             }
             continue
 
-        # Flatten all samples across all rows for this traffic class
-        all_samples: List[float] = []
-        for s in rows[value_col].dropna():
-            # Each s is something like "0.00102 2.5e-05 0.00101 ..."
-            for token in str(s).split():
-                try:
-                    all_samples.append(float(token))
-                except ValueError:
-                    continue
-
-        if not all_samples:
+        arr = class_arrays[name]
+        if arr.size == 0:
             summary["traffic_classes"][name] = {
                 "stream": tc["stream"],
                 "pcp": tc["pcp"],
@@ -168,22 +274,15 @@ def _summarize_from_vectors(vec_df: pd.DataFrame) -> Dict[str, Any]:
             }
             continue
 
-        arr = np.array(all_samples, dtype=float)
-        count = int(arr.size)
-        min_s = float(arr.min())
-        max_s = float(arr.max())
-        mean_s = float(arr.mean())
-        std_s = float(arr.std())  # seconds
-
         summary["traffic_classes"][name] = {
             "stream": tc["stream"],
             "pcp": tc["pcp"],
             "present": True,
-            "count": count,
-            "min_ms": min_s * 1e3,
-            "max_ms": max_s * 1e3,
-            "mean_ms": mean_s * 1e3,
-            "jitter_ms": std_s * 1e3,
+            "count": int(arr.size),
+            "min_ms": float(arr.min()) * 1e3,
+            "max_ms": float(arr.max()) * 1e3,
+            "mean_ms": float(arr.mean()) * 1e3,
+            "jitter_ms": float(arr.std()) * 1e3,
         }
 
     return summary
@@ -198,6 +297,12 @@ def compute_latency_bands(df: pd.DataFrame) -> Dict[str, Any]:
     Try statistics first; if not available, fall back to vectors.
     """
 
+    # Categoricals turn the repeated string comparisons below into integer
+    # compares (and shrink memory) on large CSV-R exports.
+    for col in ("type", "name"):
+        if col in df.columns and df[col].dtype == object:
+            df = df.assign(**{col: df[col].astype("category")})
+
     # ---------- Path 1: statistics ----------
     if "type" in df.columns and "name" in df.columns:
         stats_mask = (df["type"] == "statistics") & (df["name"] == "endToEndDelay")
@@ -215,15 +320,30 @@ def compute_latency_bands(df: pd.DataFrame) -> Dict[str, Any]:
             "endToEndDelay vectors or statistics."
         )
 
-    vec_mask = (df["type"] == "vector") & (df["name"].str.contains("endToEndDelay"))
+    name_col = df["name"]
+    if isinstance(name_col.dtype, pd.CategoricalDtype):
+        # Run the substring test once per category, then match rows by code.
+        etoe_codes = [
+            i
+            for i, c in enumerate(name_col.cat.categories)
+            if "endToEndDelay" in str(c)
+        ]
+        name_mask = name_col.cat.codes.isin(etoe_codes)
+    else:
+        name_mask = name_col.astype(str).str.contains("endToEndDelay")
+
+    vec_mask = (df["type"] == "vector") & name_mask
     vec_df = df.loc[vec_mask].copy()
 
     if vec_df.empty:
-        unique_names = sorted(set(df["name"].astype(str)))
+        if isinstance(name_col.dtype, pd.CategoricalDtype):
+            unique_names = name_col.cat.categories.tolist()[:20]
+        else:
+            unique_names = name_col.dropna().unique().tolist()[:20]
         raise RuntimeError(
             "No 'statistics' rows with name 'endToEndDelay' and no 'vector' rows "
             "with name containing 'endToEndDelay' found.\n"
-            f"Available names include (first few): {unique_names[:20]}"
+            f"Available names include (first few): {unique_names}"
         )
 
     vec_df = _attach_traffic_class(vec_df)
@@ -299,13 +419,17 @@ def main(argv: List[str]) -> int:
 
     args = parser.parse_args(argv)
 
-    df = pd.read_csv(args.results_csv)
+    df = _read_results_csv(args.results_csv)
     summary = compute_latency_bands(df)
     print_human_readable(summary)
 
     if args.out_json:
-        with open(args.out_json, "w") as f:
-            json.dump(summary, f, indent=2)
+        if orjson is not None:
+            with open(args.out_json, "wb") as f:
+                f.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
+        else:
+            with open(args.out_json, "w") as f:
+                json.dump(summary, f, indent=2)
         print(f"Wrote JSON summary to: {args.out_json}")
 
     return 0
@@ -16,44 +16,41 @@ def parse_sca(sca_path: Path, out_path: Path):
 
     and ignore run/config/attr lines.
     """
-    lines = sca_path.read_text().splitlines()
-    rows = []
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-
-        # We only care about scalar lines
-        if not line.startswith("scalar "):
-            continue
-
-        parts = line.split()
-        if len(parts) < 4:
-            # Expect: scalar <module> <name> <value>
-            continue
-
-        # parts[0] = "scalar"
-        module = parts[1]
-        name   = parts[2]
-
-        # value may be float or int
-        value_str = parts[3]
-        try:
-            value = float(value_str)
-        except ValueError:
-            # If it’s something odd, just skip it
-            continue
-
-        rows.append((module, name, value))
-
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    with out_path.open("w", newline="") as f:
-        writer = csv.writer(f)
+    n_rows = 0
+
+    with sca_path.open("r", buffering=2 ** 20) as f_in, \
+            out_path.open("w", newline="", buffering=2 ** 20) as f_out:
+        writer = csv.writer(f_out)
         writer.writerow(["module", "name", "value"])
-        writer.writerows(rows)
 
-    print(f"Wrote {len(rows)} rows to {out_path}")
+        for line in f_in:
+            # We only care about scalar lines
+            if not line.startswith("scalar "):
+                continue
+
+            # Only the first four tokens matter; don't tokenize attr tails.
+            parts = line.split(None, 4)
+            if len(parts) < 4:
+                # Expect: scalar <module> <name> <value>
+                continue
+
+            # parts[0] = "scalar"
+            module = parts[1]
+            name   = parts[2]
+
+            # value may be float or int
+            value_str = parts[3]
+            try:
+                value = float(value_str)
+            except ValueError:
+                # If it’s something odd, just skip it
+                continue
+
+            writer.writerow((module, name, value))
+            n_rows += 1
+
+    print(f"Wrote {n_rows} rows to {out_path}")
 
 def main():
     if len(sys.argv) != 3:
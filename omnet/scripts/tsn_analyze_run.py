@@ -23,8 +23,9 @@ import sys
 import csv
 import math
 from pathlib import Path
-import re
-from statistics import mean
+
+import numpy as np
+import pandas as pd
 
 DELAY_PREFIXES = ("endToEndDelay", "oneWayDelay", "delay")
 
@@ -32,107 +33,165 @@ def parse_scalars(sca_path: Path):
     """
     Minimal scalar parser.
 
+    The whole file is tokenized in one pass by pandas' C engine — the same
+    native-parser path parse_delays uses for .vec data — and non-scalar
+    lines (run/attr/param) are dropped afterwards with vectorized filters.
+
     Returns:
         dict[(module, name)] = float(value)
     """
-    scalars = {}
-    lines = sca_path.read_text().splitlines()
-
-    for line in lines:
-        line = line.strip()
-        if not line.startswith("scalar "):
-            continue
-
-        parts = line.split()
-        if len(parts) < 4:
-            continue
-
-        module = parts[1]
-        name = parts[2]
-        value_str = parts[3]
-
-        try:
-            value = float(value_str)
-        except ValueError:
-            continue
+    df = pd.read_csv(
+        sca_path,
+        sep=r"\s+",
+        header=None,
+        names=["kind", "module", "name", "value"],
+        usecols=[0, 1, 2, 3],
+        engine="c",
+        quoting=csv.QUOTE_NONE,
+        on_bad_lines="skip",
+    )
+
+    df = df[df["kind"] == "scalar"]
+    df = df.assign(value=pd.to_numeric(df["value"], errors="coerce"))
+    df = df.dropna(subset=["module", "name", "value"])
 
-        scalars[(module, name)] = value
-
-    return scalars
+    return {
+        (module, name): value
+        for module, name, value in zip(
+            df["module"].tolist(), df["name"].tolist(), df["value"].tolist()
+        )
+    }
 
 
 def parse_delays(vec_path: Path):
     """
     Parse delay-related vectors from .vec.
 
+    Vector declarations are collected in one streaming binary pass over the
+    whole file (OMNeT++ declares vectors lazily, so declarations may appear
+    between data blocks, not only in a prologue); the bulk data lines are
+    then parsed in a single pass by pandas' C tokenizer instead of a
+    Python-level loop over every line. Each declaration's column spec
+    (e.g. TV, ETV) decides which field holds the value for that vector id,
+    so files mixing layouts are handled.
+
     Returns:
-        dict[module] = list of (time, value) samples aggregated
-                       across all delay-like vectors for that module.
+        dict[module] = 1-D float64 ndarray of delay values aggregated across
+                       all delay-like vectors for that module. Sample times
+                       are not kept; nothing downstream uses them.
     """
-    lines = vec_path.read_text().splitlines()
-
-    # Map vector id -> (module, name)
+    # Map vector id -> (module, name); vector id -> data-line value field
     id_to_info = {}
     ids_of_interest = set()
+    vid_value_col = {}
+
+    # Declaration scan in binary mode with manual offset arithmetic —
+    # text-mode tell() before every readline defeats buffered read-ahead
+    # and costs more than the whole pandas pass on large files.
+    data_offset = None
+    offset = 0
+    with vec_path.open("rb") as f:
+        for raw in f:
+            if data_offset is None and raw[:1].isdigit():
+                data_offset = offset
+            offset += len(raw)
+
+            if not raw.startswith(b"vector "):
+                continue
+            parts = raw.decode("utf-8", errors="replace").split(maxsplit=4)
+            if len(parts) < 4:
+                continue
+            try:
+                vid = int(parts[1])
+            except ValueError:
+                continue
+            module = parts[2]
+            name = parts[3]  # e.g., endToEndDelay:vector
+
+            id_to_info[vid] = (module, name)
+
+            if name.startswith(DELAY_PREFIXES):
+                ids_of_interest.add(vid)
+                # Data lines carry the vector id followed by one field per
+                # spec letter; V marks the value field (default layout TV).
+                spec = parts[4].split()[0] if len(parts) > 4 else "TV"
+                v_pos = spec.find("V")
+                vid_value_col[vid] = 1 + (v_pos if v_pos >= 0 else len(spec) - 1)
+
+        if data_offset is None or not ids_of_interest:
+            return {}
+
+        # Data block: one C-level pass from the first data line onward,
+        # reading the id column plus every field that is a value column for
+        # some delay vector. Interleaved declaration/attr lines either
+        # mismatch the field count (skipped) or fail numeric coercion
+        # (dropped below); data lines wider than the widest delay layout
+        # can only belong to other vectors and are skipped the same way.
+        val_cols = sorted(set(vid_value_col.values()))
+        names = ["vid"] + [f"f{i}" for i in range(1, val_cols[-1] + 1)]
+
+        f.seek(data_offset)
+        df = pd.read_csv(
+            f,
+            sep=r"\s+",
+            header=None,
+            names=names,
+            usecols=[0] + val_cols,
+            engine="c",
+            quoting=csv.QUOTE_NONE,
+            on_bad_lines="skip",
+        )
+
+    # Coerce to numeric and drop anything that is not a data line
+    # (stray attr/param lines surviving into the data block).
+    df["vid"] = pd.to_numeric(df["vid"], errors="coerce")
+    df = df.dropna(subset=["vid"])
+
+    vid_filter = np.fromiter(ids_of_interest, dtype=np.int64)
+    df = df[df["vid"].isin(vid_filter)]
+    if df.empty:
+        return {}
+
+    vids = df["vid"].astype(np.int64)
+
+    # Pick each row's value from the column its vector's layout dictates.
+    if len(val_cols) == 1:
+        values = pd.to_numeric(df[f"f{val_cols[0]}"], errors="coerce")
+    else:
+        row_col = vids.map(vid_value_col)
+        values = pd.Series(
+            np.select(
+                [row_col == c for c in val_cols],
+                [pd.to_numeric(df[f"f{c}"], errors="coerce") for c in val_cols],
+                default=np.nan,
+            ),
+            index=df.index,
+        )
+
+    keep = values.notna()
+    vids = vids[keep]
+    values = values[keep]
+
+    vid_to_module = {vid: id_to_info[vid][0] for vid in ids_of_interest}
+    module_col = vids.map(vid_to_module)
 
-    vec_def_re = re.compile(r'^vector\s+(\d+)\s+([^\s]+)\s+([^\s]+)')
-
-    # First pass: find delay-related vector definitions
-    for line in lines:
-        m = vec_def_re.match(line)
-        if not m:
-            continue
-        vid = int(m.group(1))
-        module = m.group(2)
-        name = m.group(3)  # e.g., endToEndDelay:vector
-
-        id_to_info[vid] = (module, name)
-
-        if name.startswith(DELAY_PREFIXES):
-            ids_of_interest.add(vid)
-
-    # Second pass: data lines
     per_module_samples = {}
-
-    for line in lines:
-        if not line or not line[0].isdigit():
-            continue
-
-        parts = line.split()
-        if len(parts) < 3:
-            continue
-
-        try:
-            vid = int(parts[0])
-        except ValueError:
-            continue
-
-        if vid not in ids_of_interest:
-            continue
-
-        try:
-            t = float(parts[1])
-            v = float(parts[2])
-        except ValueError:
-            continue
-
-        module, _ = id_to_info.get(vid, ("", ""))
-        if module == "":
-            continue
-
-        per_module_samples.setdefault(module, []).append((t, v))
+    for module, grp in values.groupby(module_col, sort=False):
+        per_module_samples[module] = grp.to_numpy(dtype=np.float64)
 
     return per_module_samples
 
 
 def latency_stats(samples):
     """
-    Compute basic latency stats from a list of (time, value) samples.
+    Compute basic latency stats from delay samples, given as a 1-D value
+    array (or an (n, 2) array / list of (time, value) tuples for callers
+    still holding timestamped samples).
 
     Returns:
         dict with keys: count, min, max, mean, p50, p95
     """
-    if not samples:
+    if len(samples) == 0:
         return {
             "count": 0,
             "min": math.nan,
@@ -142,22 +201,27 @@ def latency_stats(samples):
             "p95": math.nan,
         }
 
-    values = sorted(v for (_, v) in samples)
-    n = len(values)
+    if isinstance(samples, np.ndarray):
+        values = samples[:, 1] if samples.ndim == 2 else samples
+    else:
+        values = np.fromiter(
+            (v for (_, v) in samples), dtype=np.float64, count=len(samples)
+        )
+
+    n = int(values.size)
 
-    def percentile(p):
-        if n == 0:
-            return math.nan
-        idx = min(n - 1, max(0, int(round((p / 100.0) * (n - 1)))))
-        return values[idx]
+    # Only p50/p95 are needed, so a partial O(n) partition beats a full sort.
+    k50 = min(n - 1, max(0, int(round(0.50 * (n - 1)))))
+    k95 = min(n - 1, max(0, int(round(0.95 * (n - 1)))))
+    part = np.partition(values, sorted({k50, k95}))
 
     return {
         "count": n,
-        "min": values[0],
-        "max": values[-1],
-        "mean": mean(values),
-        "p50": percentile(50),
-        "p95": percentile(95),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "mean": float(values.mean()),
+        "p50": float(part[k50]),
+        "p95": float(part[k95]),
     }
 
 
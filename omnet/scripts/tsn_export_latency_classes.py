@@ -48,7 +48,7 @@ def main(argv: List[str] | None = None) -> int:
     if out_dir and not os.path.isdir(out_dir):
         os.makedirs(out_dir, exist_ok=True)
 
-    fieldnames = [
+    fieldnames = (
         "config",
         "class",
         "stream",
@@ -59,26 +59,25 @@ def main(argv: List[str] | None = None) -> int:
         "mean_ms",
         "max_ms",
         "jitter_ms",
-    ]
+    )
 
     with open(args.out_csv, "w", newline="") as f_out:
-        writer = csv.DictWriter(f_out, fieldnames=fieldnames)
-        writer.writeheader()
+        writer = csv.writer(f_out)
+        writer.writerow(fieldnames)
 
         for cls_name, info in classes.items():
-            row = {
-                "config": args.config_name,
-                "class": cls_name,
-                "stream": info.get("stream", ""),
-                "pcp": info.get("pcp", ""),
-                "present": info.get("present", False),
-                "count": info.get("count", 0),
-                "min_ms": info.get("min_ms", ""),
-                "mean_ms": info.get("mean_ms", ""),
-                "max_ms": info.get("max_ms", ""),
-                "jitter_ms": info.get("jitter_ms", ""),
-            }
-            writer.writerow(row)
+            writer.writerow((
+                args.config_name,
+                cls_name,
+                info.get("stream", ""),
+                info.get("pcp", ""),
+                info.get("present", False),
+                info.get("count", 0),
+                info.get("min_ms", ""),
+                info.get("mean_ms", ""),
+                info.get("max_ms", ""),
+                info.get("jitter_ms", ""),
+            ))
 
     print(f"Wrote latency class CSV to: {args.out_csv}")
     return 0
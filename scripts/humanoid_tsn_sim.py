@@ -17,31 +17,53 @@ Everything is intentionally minimal and human-readable.
 """
 
 import argparse
+import asyncio
+import copy
+import functools
 import json
 import os
+import re
 import shutil
-import subprocess
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Tuple
 
 try:
     import yaml  # type: ignore
+
+    try:
+        # libyaml-backed parser; ~10x faster than the pure-Python scanner
+        from yaml import CSafeLoader as _YamlLoader  # type: ignore
+    except ImportError:
+        from yaml import SafeLoader as _YamlLoader  # type: ignore
 except ImportError:
     yaml = None
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
 
 # ---------------------------------------------------------------------------
 # YAML helpers
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=32)
+def _load_yaml_cached(path_str: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    # mtime_ns/size are part of the cache key so edits invalidate naturally.
+    with open(path_str, "r") as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
+
+
 def load_yaml(path: Path) -> Dict[str, Any]:
     if yaml is None:
         raise RuntimeError(
             "PyYAML is not installed inside the container. "
             "Install pyyaml into the OMNeT++ venv (see Dockerfile.tsn-sim)."
         )
-    with path.open("r") as f:
-        return yaml.safe_load(f) or {}
+    st = path.stat()
+    # Deep-copy so callers can mutate their result without poisoning the cache.
+    return copy.deepcopy(_load_yaml_cached(str(path), st.st_mtime_ns, st.st_size))
 
 
 # ---------------------------------------------------------------------------
@@ -84,20 +106,24 @@ def map_node_module(node: Dict[str, Any]) -> str:
     return "inet.node.tsn.TsnDevice"
 
 
+_SPEED_RE = re.compile(r"^(\d+(?:\.\d+)?)(GBPS|MBPS|G|M)$")
+
+_SPEED_SUFFIX = {
+    "G": "Gbps",
+    "GBPS": "Gbps",
+    "M": "Mbps",
+    "MBPS": "Mbps",
+}
+
+
 def map_link_datarate(speed: str) -> str:
     """
     Map YAML speed like '25G', '1G', '100M', '10M' to OMNeT++ datarate strings.
     """
-    s = speed.strip().upper()
-    if s.endswith("GBPS"):
-        return s
-    if s.endswith("G"):
-        return s[:-1] + "Gbps"
-    if s.endswith("MBPS"):
-        return s
-    if s.endswith("M"):
-        return s[:-1] + "Mbps"
-    return "1Gbps"
+    m = _SPEED_RE.match(speed.strip().upper())
+    if not m:
+        return "1Gbps"
+    return m.group(1) + _SPEED_SUFFIX[m.group(2)]
 
 
 def map_link_delay(link: Dict[str, Any]) -> str:
@@ -117,6 +143,16 @@ def map_link_delay(link: Dict[str, Any]) -> str:
 # NED generation
 # ---------------------------------------------------------------------------
 
+NED_HEADER = """\
+package humanoidtsn;
+
+import inet.node.tsn.TsnDevice;
+import inet.node.tsn.TsnSwitch;
+import ned.DatarateChannel;
+
+"""
+
+
 def generate_ned(topology: Dict[str, Any], network_name: str = "HumanoidTsnNetwork") -> str:
     """
     Generate a simple NED network from the YAML topology.
@@ -140,69 +176,67 @@ def generate_ned(topology: Dict[str, Any], network_name: str = "HumanoidTsnNetwo
     nodes = topology.get("nodes", {})
     links = topology.get("links", [])
 
-    lines: List[str] = []
-    lines.append("package humanoidtsn;")
-    lines.append("")
-    lines.append("import inet.node.tsn.TsnDevice;")
-    lines.append("import inet.node.tsn.TsnSwitch;")
-    lines.append("import ned.DatarateChannel;")
-    lines.append("")
-    lines.append(f"network {network_name}")
-    lines.append("{")
-    lines.append("    parameters:")
-    lines.append('        @display("bgb=900,600");')
-    lines.append("")
-    lines.append("    submodules:")
-
     # Submodules – simple grid layout
     x_step = 150
+    submods: List[str] = []
     for idx, (name, node) in enumerate(nodes.items()):
         module_type = map_node_module(node)
         x = 100 + (idx % 5) * x_step
         y = 100 + (idx // 5) * 120
-        lines.append(f"        {name}: {module_type} {{")
-        lines.append(f'            @display("p={x},{y}");')
-        lines.append("        }")
-
-    lines.append("")
-    lines.append("    channels:")
+        submods.append(
+            f"        {name}: {module_type} {{\n"
+            f'            @display("p={x},{y}");\n'
+            f"        }}\n"
+        )
 
-    # Channels – one DatarateChannel per link
+    # Channels + connections in one pass over the links
+    chans: List[str] = []
+    conns: List[str] = []
     for i, link in enumerate(links):
         lname = link.get("name") or f"link{i}"
+        chan_name = f"{lname}Channel"
         datarate = map_link_datarate(str(link.get("speed", "1G")))
         delay = map_link_delay(link)
-        chan_name = f"{lname}Channel"
-        lines.append(f"        {chan_name}: DatarateChannel {{")
-        lines.append(f"            datarate = {datarate};")
-        lines.append(f"            delay = {delay};")
-        lines.append("        }")
-
-    lines.append("")
-    lines.append("    connections allowunconnected:")
+        chans.append(
+            f"        {chan_name}: DatarateChannel {{\n"
+            f"            datarate = {datarate};\n"
+            f"            delay = {delay};\n"
+            f"        }}\n"
+        )
 
-    # Connections
-    for i, link in enumerate(links):
-        lname = link.get("name") or f"link{i}"
-        chan_name = f"{lname}Channel"
         eps = link.get("endpoints", [])
         if len(eps) == 2:
             a, b = eps
             # Using ethg++ as a generic Ethernet gate vector; adjust once real INET TSN types are in.
-            lines.append(f"        {a}.ethg++ <--> {chan_name} <--> {b}.ethg++;")
-
-    lines.append("}")
-    lines.append("")
-    return "\n".join(lines)
+            conns.append(f"        {a}.ethg++ <--> {chan_name} <--> {b}.ethg++;\n")
+
+    # Each fragment ends with its own newline so empty sections collapse
+    # exactly like the line-list builder did (one blank line, not two).
+    return "".join([
+        NED_HEADER,
+        f"network {network_name}\n",
+        "{\n"
+        "    parameters:\n"
+        '        @display("bgb=900,600");\n'
+        "\n"
+        "    submodules:\n",
+        *submods,
+        "\n    channels:\n",
+        *chans,
+        "\n    connections allowunconnected:\n",
+        *conns,
+        "}\n",
+    ])
 
 
 # ---------------------------------------------------------------------------
 # INI generation (TSN/Qbv scaffolding)
 # ---------------------------------------------------------------------------
 
-def generate_qbv_ini(schedule: Dict[str, Any]) -> List[str]:
+def generate_qbv_ini(schedule: Dict[str, Any]) -> Iterator[str]:
     """
-    Generate TSN Qbv gate schedule snippets from YAML.
+    Generate TSN Qbv gate schedule snippets from YAML, one INI line at a
+    time (consumed via lines.extend in generate_ini).
 
     Expected schedule YAML (first pass):
 
@@ -217,7 +251,6 @@ def generate_qbv_ini(schedule: Dict[str, Any]) -> List[str]:
               durations_ms: [1.0, 1.0]
     """
     switches = schedule.get("switches", [])
-    out: List[str] = []
 
     for sw in switches:
         swname = sw["name"]
@@ -225,7 +258,7 @@ def generate_qbv_ini(schedule: Dict[str, Any]) -> List[str]:
         if not queues:
             continue
 
-        out.append(f"*.{swname}.eth[*].macLayer.queue.numTrafficClasses = {len(queues)}")
+        yield f"*.{swname}.eth[*].macLayer.queue.numTrafficClasses = {len(queues)}"
 
         for q in queues:
             tc = int(q["traffic_class"])
@@ -233,12 +266,10 @@ def generate_qbv_ini(schedule: Dict[str, Any]) -> List[str]:
             durations_ms = q.get("durations_ms", [])
             dlist = "[" + ",".join(f"{d}ms" for d in durations_ms) + "]"
 
-            out.append(f"*.{swname}.eth[*].macLayer.queue.transmissionGate[{tc}].offset = {offset_ms}ms")
-            out.append(f"*.{swname}.eth[*].macLayer.queue.transmissionGate[{tc}].durations = {dlist}")
+            yield f"*.{swname}.eth[*].macLayer.queue.transmissionGate[{tc}].offset = {offset_ms}ms"
+            yield f"*.{swname}.eth[*].macLayer.queue.transmissionGate[{tc}].durations = {dlist}"
 
-        out.append("")
-
-    return out
+        yield ""
 
 
 def generate_ini(
@@ -285,9 +316,12 @@ def generate_ini(
 # OMNeT++ runner with robust opp_run lookup
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=1)
 def _find_opp_run_executable() -> str:
     """
-    Search for the OMNeT++ 'opp_run' binary.
+    Search for the OMNeT++ 'opp_run' binary. The result is memoized; the
+    install location doesn't change within a process, and sweeps would
+    otherwise re-scan PATH plus four filesystem candidates per run.
 
     Search order:
       1. PATH
@@ -318,16 +352,58 @@ def _find_opp_run_executable() -> str:
     )
 
 
+async def _run_opp_async(
+    opp_run_exe: str,
+    ini_path: Path,
+    cwd: Path,
+    sem: "asyncio.Semaphore",
+) -> None:
+    async with sem:
+        cmd = [opp_run_exe, "-u", "Cmdenv", "-f", str(ini_path)]
+        print(f"[stingray] Running OMNeT++: {' '.join(cmd)} (cwd={cwd})")
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=str(cwd),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+        )
+        assert proc.stdout is not None
+        async for raw in proc.stdout:
+            print(f"[{ini_path.parent.name}] {raw.decode(errors='replace').rstrip()}")
+        rc = await proc.wait()
+        if rc != 0:
+            raise RuntimeError(f"opp_run exited with code {rc} for {ini_path}")
+
+
+def run_opp_run_batch(runs: List[Tuple[Path, Path]], max_parallel: int = 0) -> None:
+    """
+    Run several OMNeT++ simulations concurrently.
+
+        runs: list of (ini_path, cwd) pairs
+        max_parallel: process cap (defaults to the CPU count)
+
+    Logs are streamed line by line, prefixed with the run directory, so
+    interleaved output stays attributable.
+    """
+    opp_run_exe = _find_opp_run_executable()
+    limit = max_parallel or os.cpu_count() or 1
+
+    async def _gather() -> None:
+        sem = asyncio.Semaphore(limit)
+        await asyncio.gather(
+            *(_run_opp_async(opp_run_exe, ini, cwd, sem) for ini, cwd in runs)
+        )
+
+    asyncio.run(_gather())
+
+
 def run_opp_run(ini_path: Path, cwd: Path) -> None:
     """
     Run OMNeT++ in CLI mode.
 
         opp_run -u Cmdenv -f omnetpp.ini
     """
-    opp_run_exe = _find_opp_run_executable()
-    cmd = [opp_run_exe, "-u", "Cmdenv", "-f", str(ini_path)]
-    print(f"[stingray] Running OMNeT++: {' '.join(cmd)} (cwd={cwd})")
-    subprocess.run(cmd, cwd=str(cwd), check=True)
+    run_opp_run_batch([(ini_path, cwd)], max_parallel=1)
 
 
 # ---------------------------------------------------------------------------
@@ -339,8 +415,17 @@ def extract_metrics_with_scavetool(run_dir: Path) -> Dict[str, Any]:
     Minimal stub – just reports what .sca/.vec files exist.
     Replace with real scavetool integration once TSN flows are defined.
     """
-    scalar_files = list(run_dir.glob("*.sca"))
-    vector_files = list(run_dir.glob("*.vec"))
+    # One scandir pass picks up both extensions; glob would walk the
+    # directory once per pattern and build a Path per entry.
+    scalar_files: List[str] = []
+    vector_files: List[str] = []
+    with os.scandir(run_dir) as it:
+        for entry in it:
+            name = entry.name
+            if name.endswith(".sca"):
+                scalar_files.append(name)
+            elif name.endswith(".vec"):
+                vector_files.append(name)
 
     if not scalar_files and not vector_files:
         return {
@@ -350,8 +435,8 @@ def extract_metrics_with_scavetool(run_dir: Path) -> Dict[str, Any]:
 
     return {
         "status": "ok",
-        "scalars": [p.name for p in scalar_files],
-        "vectors": [p.name for p in vector_files],
+        "scalars": scalar_files,
+        "vectors": vector_files,
         "note": "scavetool extraction not yet implemented",
     }
 
@@ -372,11 +457,14 @@ def simulate(topology_path: Path, traffic_path: Path, schedule_path: Path, outpu
     ned_path = gen_dir / "tsn_network.ned"
     ini_path = gen_dir / "omnetpp.ini"
 
+    # write_bytes skips the text-layer encoder pass over the generated text.
     print(f"[stingray] Generating NED → {ned_path}")
-    ned_path.write_text(generate_ned(topology))
+    ned_path.write_bytes(generate_ned(topology).encode("utf-8"))
 
     print(f"[stingray] Generating INI → {ini_path}")
-    ini_path.write_text(generate_ini(topology, traffic, schedule, ned_path.name))
+    ini_path.write_bytes(
+        generate_ini(topology, traffic, schedule, ned_path.name).encode("utf-8")
+    )
 
     # Run OMNeT++
     run_opp_run(ini_path, cwd=gen_dir)
@@ -387,7 +475,15 @@ def simulate(topology_path: Path, traffic_path: Path, schedule_path: Path, outpu
     output_path = output_path.resolve()
     output_path.parent.mkdir(parents=True, exist_ok=True)
     print(f"[stingray] Writing JSON → {output_path}")
-    output_path.write_text(json.dumps(metrics, indent=2))
+    if orjson is not None:
+        output_path.write_bytes(
+            orjson.dumps(
+                metrics,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE,
+            )
+        )
+    else:
+        output_path.write_text(json.dumps(metrics, indent=2) + "\n")
 
 
 # ---------------------------------------------------------------------------